@@ -120,31 +120,34 @@ def _generate_replicate(ns, node):
 
 # Print Expression ---------------------------------------------------------------------------------
 
-def _generate_expression(ns, node):
-    # Constant.
-    if isinstance(node, Constant):
-        return _generate_constant(node)
-
-    # Signal.
-    elif isinstance(node, Signal):
-        return ns.get_name(node), node.signed
-
-    # Operator.
-    elif isinstance(node, _Operator):
-        return _generate_operator(ns, node)
-
-    # Slice.
-    elif isinstance(node, _Slice):
-        return _generate_slice(ns, node)
-
-    # Cat.
-    elif isinstance(node, Cat):
-        return _generate_cat(ns, node)
-
-    # Replicate.
-    elif isinstance(node, Replicate):
-        return _generate_replicate(ns, node)
-
-    # Unknown.
-    else:
-        raise TypeError(f"Expression of unrecognized type: '{type(node).__name__}'")
+def _generate_expression(ns, node, cache=None):
+    # Cached (keyed by node identity, node kept in the entry to pin its id during the conversion).
+    if cache is not None:
+        entry = cache.get(id(node))
+        if entry is None:
+            entry = cache[id(node)] = (node, _generate_expression(ns, node))
+        return entry[1]
+
+    # Dispatch on node type.
+    generator = _expression_generators.get(type(node))
+    if generator is None:
+        # Subclass (ex CSRField, Signed, ...): look up its bases and remember the result.
+        for base in type(node).__mro__:
+            generator = _expression_generators.get(base)
+            if generator is not None:
+                _expression_generators[type(node)] = generator
+                break
+        # Unknown.
+        else:
+            raise TypeError(f"Expression of unrecognized type: '{type(node).__name__}'")
+    return generator(ns, node)
+
+# Node type -> generator table used by _generate_expression (subclasses are added on first use).
+_expression_generators = {
+    Constant  : lambda ns, node: _generate_constant(node),
+    Signal    : lambda ns, node: (ns.get_name(node), node.signed),
+    _Operator : _generate_operator,
+    _Slice    : _generate_slice,
+    Cat       : _generate_cat,
+    Replicate : _generate_replicate,
+}
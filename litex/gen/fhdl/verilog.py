@@ -13,12 +13,12 @@
 # This file is Copyright (c) 2018 Robin Ole Heinemann <robin.ole.heinemann@t-online.de>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import time
 import datetime
 import collections
 
 from enum import IntEnum
 from operator import itemgetter
+from functools import lru_cache
 
 from migen.fhdl.structure   import *
 from migen.fhdl.structure   import _Operator, _Slice, _Assign, _Fragment
@@ -31,6 +31,8 @@ from litex.gen import LiteXContext
 from litex.gen.fhdl.expression import _generate_expression, _generate_signal
 from litex.gen.fhdl.namer      import build_signal_namespace
 from litex.gen.fhdl.hierarchy  import LiteXHierarchyExplorer
+from litex.gen.fhdl.memory     import _memory_generate_verilog
+from litex.gen.fhdl.instance   import _instance_generate_verilog
 
 from litex.build.tools import get_litex_git_revision
 
@@ -40,7 +42,16 @@ from litex.build.tools import get_litex_git_revision
 
 _tab = " "*4
 
-def _generate_banner(filename, device):
+@lru_cache(maxsize=1)
+def _cached_git_revision():
+    # LiteX revision does not change during a build: only call git once per process.
+    return get_litex_git_revision()
+
+# Precomputed indentation strings (fallback to multiplication for deeper levels).
+_INDENT_LEVELS = 64
+_INDENT        = tuple(_tab*i for i in range(_INDENT_LEVELS))
+
+def _generate_banner(filename, device, revision, date):
     return """\
 // -----------------------------------------------------------------------------
 // Auto-Generated by:        __   _ __      _  __
@@ -58,17 +69,17 @@ def _generate_banner(filename, device):
 """.format(
     device   = device,
     filename = filename,
-    revision = get_litex_git_revision(),
-    date     = datetime.datetime.fromtimestamp(time.time()).strftime("%Y-%m-%d %H:%M:%S")
+    revision = revision,
+    date     = date
 )
 
-def _generate_trailer():
+def _generate_trailer(date):
     return """
 // -----------------------------------------------------------------------------
 //  Auto-Generated by LiteX on {date}.
 //------------------------------------------------------------------------------
 """.format(
-    date=datetime.datetime.fromtimestamp(time.time()).strftime("%Y-%m-%d %H:%M:%S")
+    date=date
 )
 
 def _generate_separator(msg=""):
@@ -107,7 +118,7 @@ def _generate_hierarchy(top):
 #                                    RESERVED KEYWORDS                                             #
 # ------------------------------------------------------------------------------------------------ #
 
-_ieee_1800_2017_verilog_reserved_keywords = {
+_ieee_1800_2017_verilog_reserved_keywords = frozenset({
      "accept_on",          "alias",          "always",         "always_comb",          "always_ff",
   "always_latch",            "and",          "assert",              "assign",             "assume",
      "automatic",         "before",           "begin",                "bind",               "bins",
@@ -141,7 +152,7 @@ _ieee_1800_2017_verilog_reserved_keywords = {
          "pull1",       "pulldown",          "pullup", "pulsestyle_ondetect", "pulsestyle_onevent",
           "pure",           "rand",           "randc",            "randcase",       "randsequence",
          "rcmos",           "real",        "realtime",                 "ref",                "reg",
-     "reject_on",        "release",    "      repeat",            "restrict",             "return",
+     "reject_on",        "release",          "repeat",            "restrict",             "return",
          "rnmos",          "rpmos",           "rtran",            "rtranif0",           "rtranif1",
       "s_always",   "s_eventually",      "s_nexttime",             "s_until",       "s_until_with",
       "scalared",       "sequence",        "shortint",           "shortreal",      "showcancelled",
@@ -152,13 +163,13 @@ _ieee_1800_2017_verilog_reserved_keywords = {
           "this",     "throughout",            "time",       "timeprecision",           "timeunit",
           "tran",        "tranif0",         "tranif1",                 "tri",               "tri0",
           "tri1",         "triand",           "trior",              "trireg",               "type",
-       "typedef",   "       union",          "unique",             "unique0",           "unsigned",
-         "until",     "until_with",         "untyped",                 "use",           "   uwire",
+       "typedef",          "union",          "unique",             "unique0",           "unsigned",
+         "until",     "until_with",         "untyped",                 "use",              "uwire",
            "var",       "vectored",         "virtual",                "void",               "wait",
     "wait_order",           "wand",            "weak",               "weak0",              "weak1",
          "while",       "wildcard",            "wire",                "with",             "within",
            "wor",           "xnor",             "xor",
-}
+})
 
 # ------------------------------------------------------------------------------------------------ #
 #                                          NODES                                                   #
@@ -169,10 +180,18 @@ class AssignType(IntEnum):
     NON_BLOCKING = 1
     SIGNAL       = 2
 
-def _generate_node(ns, at, level, node, target_filter=None):
+def _case_sort_key(case):
+    return case[0].value
+
+def _generate_node(out, ns, at, level, node, target_filter=None, expr_cache=None):
     assert at in [item.value for item in AssignType]
     if target_filter is not None and target_filter not in list_targets(node):
-        return ""
+        return
+
+    # List/Tuple (checked first: most common node and cheaper than the Iterable ABC check).
+    elif isinstance(node, (list, tuple)):
+        for n in node:
+            _generate_node(out, ns, at, level, n, target_filter, expr_cache)
 
     # Assignment.
     elif isinstance(node, _Assign):
@@ -184,40 +203,35 @@ def _generate_node(ns, at, level, node, target_filter=None):
             assignment = " = "
         else:
             assignment = " <= "
-        return _tab*level + _generate_expression(ns, node.l)[0] + assignment + _generate_expression(ns, node.r)[0] + ";\n"
-
-    # Iterable.
-    elif isinstance(node, collections.abc.Iterable):
-        return "".join(_generate_node(ns, at, level, n, target_filter) for n in node)
+        indent = _INDENT[level] if level < _INDENT_LEVELS else _tab*level
+        out.append(indent + _generate_expression(ns, node.l, expr_cache)[0] + assignment + _generate_expression(ns, node.r, expr_cache)[0] + ";\n")
 
     # If.
     elif isinstance(node, If):
-        r = _tab*level + "if (" + _generate_expression(ns, node.cond)[0] + ") begin\n"
-        r += _generate_node(ns, at, level + 1, node.t, target_filter)
+        indent = _INDENT[level] if level < _INDENT_LEVELS else _tab*level
+        out.append(indent + "if (" + _generate_expression(ns, node.cond, expr_cache)[0] + ") begin\n")
+        _generate_node(out, ns, at, level + 1, node.t, target_filter, expr_cache)
         if node.f:
-            r += _tab*level + "end else begin\n"
-            r += _generate_node(ns, at, level + 1, node.f, target_filter)
-        r += _tab*level + "end\n"
-        return r
+            out.append(indent + "end else begin\n")
+            _generate_node(out, ns, at, level + 1, node.f, target_filter, expr_cache)
+        out.append(indent + "end\n")
 
     # Case.
     elif isinstance(node, Case):
         if node.cases:
-            r = _tab*level + "case (" + _generate_expression(ns, node.test)[0] + ")\n"
-            css = [(k, v) for k, v in node.cases.items() if isinstance(k, Constant)]
-            css = sorted(css, key=lambda x: x[0].value)
+            indent      = _INDENT[level]     if level     < _INDENT_LEVELS else _tab*level
+            case_indent = _INDENT[level + 1] if level + 1 < _INDENT_LEVELS else _tab*(level + 1)
+            out.append(indent + "case (" + _generate_expression(ns, node.test, expr_cache)[0] + ")\n")
+            css = sorted(((k, v) for k, v in node.cases.items() if isinstance(k, Constant)), key=_case_sort_key)
             for choice, statements in css:
-                r += _tab*(level + 1) + _generate_expression(ns, choice)[0] + ": begin\n"
-                r += _generate_node(ns, at, level + 2, statements, target_filter)
-                r += _tab*(level + 1) + "end\n"
+                out.append(case_indent + _generate_expression(ns, choice, expr_cache)[0] + ": begin\n")
+                _generate_node(out, ns, at, level + 2, statements, target_filter, expr_cache)
+                out.append(case_indent + "end\n")
             if "default" in node.cases:
-                r += _tab*(level + 1) + "default: begin\n"
-                r += _generate_node(ns, at, level + 2, node.cases["default"], target_filter)
-                r += _tab*(level + 1) + "end\n"
-            r += _tab*level + "endcase\n"
-            return r
-        else:
-            return ""
+                out.append(case_indent + "default: begin\n")
+                _generate_node(out, ns, at, level + 2, node.cases["default"], target_filter, expr_cache)
+                out.append(case_indent + "end\n")
+            out.append(indent + "endcase\n")
 
     # Display.
     elif isinstance(node, Display):
@@ -228,11 +242,18 @@ def _generate_node(ns, at, level, node, target_filter=None):
                 s += ns.get_name(arg)
             else:
                 s += str(arg)
-        return _tab*level + "$display(" + s + ");\n"
+        indent = _INDENT[level] if level < _INDENT_LEVELS else _tab*level
+        out.append(indent + "$display(" + s + ");\n")
 
     # Finish.
     elif isinstance(node, Finish):
-        return _tab*level + "$finish;\n"
+        indent = _INDENT[level] if level < _INDENT_LEVELS else _tab*level
+        out.append(indent + "$finish;\n")
+
+    # Other Iterables.
+    elif isinstance(node, collections.abc.Iterable):
+        for n in node:
+            _generate_node(out, ns, at, level, n, target_filter, expr_cache)
 
     # Unknown.
     else:
@@ -242,10 +263,16 @@ def _generate_node(ns, at, level, node, target_filter=None):
 #                                        ATTRIBUTES                                                #
 # ------------------------------------------------------------------------------------------------ #
 
+def _attribute_sort_key(attr):
+    return ("", attr) if isinstance(attr, str) else attr
+
 def _generate_attribute(attr, attr_translate):
+    # Most Signals/Specials have no attributes.
+    if not attr:
+        return ""
     r = ""
     first = True
-    for attr in sorted(attr, key=lambda x: ("", x) if isinstance(x, str) else x):
+    for attr in sorted(attr, key=_attribute_sort_key):
         if isinstance(attr, tuple):
             # Platform-dependent attribute.
             attr_name, attr_value = attr
@@ -258,7 +285,7 @@ def _generate_attribute(attr, attr_translate):
         if not first:
             r += ", "
         first = False
-        const_expr = "\"" + attr_value + "\"" if not isinstance(attr_value, int) else str(attr_value)
+        const_expr = str(attr_value) if isinstance(attr_value, int) else f"\"{attr_value}\""
         r += attr_name + " = " + const_expr
     if r:
         r = "(* " + r + " *)\n"
@@ -272,24 +299,17 @@ def _use_wire(stmts):
     return (len(stmts) == 1 and isinstance(stmts[0], _Assign) and
             not isinstance(stmts[0].l, _Slice))
 
-def _list_comb_wires(f):
+def _list_comb_wires(groups):
     r = set()
-    groups = group_by_targets(f.comb)
     for g in groups:
         if _use_wire(g[1]):
             r |= g[0]
     return r
 
-def _generate_module(f, ios, name, ns, attr_translate):
-    sigs         = list_signals(f) | list_special_ios(f, ins=True, outs=True, inouts=True)
-    special_outs = list_special_ios(f, ins=False, outs=True,  inouts=True)
-    inouts       = list_special_ios(f, ins=False, outs=False, inouts=True)
-    targets      = list_targets(f) | special_outs
-    wires        = _list_comb_wires(f) | special_outs
-
+def _generate_module(ios, name, ns, name_of, targets, inouts, wires, attr_translate):
     r = f"module {name} (\n"
     firstp = True
-    for sig in sorted(ios, key=lambda x: ns.get_name(x)):
+    for sig in sorted(ios, key=name_of.__getitem__):
         if not firstp:
             r += ",\n"
         firstp = False
@@ -297,7 +317,7 @@ def _generate_module(f, ios, name, ns, attr_translate):
         if attr:
             r += _tab + attr
         sig.type = "wire"
-        sig.name = ns.get_name(sig)
+        sig.name = name_of[sig]
         sig.port = True
         if sig in inouts:
             sig.direction = "inout"
@@ -316,22 +336,18 @@ def _generate_module(f, ios, name, ns, attr_translate):
 
     return r
 
-def _generate_signals(f, ios, name, ns, attr_translate, regs_init):
-    sigs = list_signals(f) | list_special_ios(f, ins=True, outs=True, inouts=True)
-    special_outs = list_special_ios(f, ins=False, outs=True,  inouts=True)
-    inouts       = list_special_ios(f, ins=False, outs=False, inouts=True)
-    targets      = list_targets(f) | special_outs
-    wires        = _list_comb_wires(f) | special_outs
-
+def _generate_signals(sigs, ios, ns, name_of, expr_cache, wires, attr_translate, regs_init):
+    items = [(name_of[sig], sig) for sig in sigs if sig not in ios]
+    items.sort(key=itemgetter(0))
     r = ""
-    for sig in sorted(sigs - ios, key=lambda x: ns.get_name(x)):
+    for _, sig in items:
         r += _generate_attribute(sig.attr, attr_translate)
         if sig in wires:
             r += "wire " + _generate_signal(ns, sig) + ";\n"
         else:
             r += "reg  " + _generate_signal(ns, sig)
             if regs_init:
-                r += " = " + _generate_expression(ns, sig.reset)[0]
+                r += " = " + _generate_expression(ns, sig.reset, expr_cache)[0]
             r += ";\n"
     return r
 
@@ -339,8 +355,8 @@ def _generate_signals(f, ios, name, ns, attr_translate, regs_init):
 #                                  COMBINATORIAL LOGIC                                             #
 # ------------------------------------------------------------------------------------------------ #
 
-def _generate_combinatorial_logic_sim(f, ns):
-    r = ""
+def _generate_combinatorial_logic_sim(f, ns, name_of, expr_cache):
+    r = []
     if f.comb:
         target_stmt_map = collections.defaultdict(list)
 
@@ -349,72 +365,68 @@ def _generate_combinatorial_logic_sim(f, ns):
             for t in targets:
                 target_stmt_map[t].append(statement)
 
-        groups = group_by_targets(f.comb)
-
-        for n, (t, stmts) in enumerate(target_stmt_map.items()):
+        for t, stmts in target_stmt_map.items():
             assert isinstance(t, Signal)
             if _use_wire(stmts):
-                r += "assign " + _generate_node(ns, AssignType.BLOCKING, 0, stmts[0])
+                r.append("assign ")
+                _generate_node(r, ns, AssignType.BLOCKING, 0, stmts[0], expr_cache=expr_cache)
             else:
-                r += "always @(*) begin\n"
-                r += _tab + ns.get_name(t) + " <= " + _generate_expression(ns, t.reset)[0] + ";\n"
-                r += _generate_node(ns, AssignType.NON_BLOCKING, 1, stmts, t)
-                r += "end\n"
-    r += "\n"
-    return r
-
-def _generate_combinatorial_logic_synth(f, ns):
-    r = ""
-    if f.comb:
-        groups = group_by_targets(f.comb)
-
+                r.append("always @(*) begin\n")
+                r.append(_tab + name_of[t] + " <= " + _generate_expression(ns, t.reset, expr_cache)[0] + ";\n")
+                _generate_node(r, ns, AssignType.NON_BLOCKING, 1, stmts, t, expr_cache=expr_cache)
+                r.append("end\n")
+    r.append("\n")
+    return "".join(r)
+
+def _generate_combinatorial_logic_synth(groups, ns, name_of, expr_cache):
+    r = []
+    if groups:
         for n, g in enumerate(groups):
             if _use_wire(g[1]):
-                r += "assign " + _generate_node(ns, AssignType.BLOCKING, 0, g[1][0])
+                r.append("assign ")
+                _generate_node(r, ns, AssignType.BLOCKING, 0, g[1][0], expr_cache=expr_cache)
             else:
-                r += "always @(*) begin\n"
-                for t in sorted(g[0], key=lambda x: ns.get_name(x)):
-                    r += _tab + ns.get_name(t) + " <= " + _generate_expression(ns, t.reset)[0] + ";\n"
-                r += _generate_node(ns, AssignType.NON_BLOCKING, 1, g[1])
-                r += "end\n"
-    r += "\n"
-    return r
+                r.append("always @(*) begin\n")
+                for t in sorted(g[0], key=name_of.__getitem__):
+                    r.append(_tab + name_of[t] + " <= " + _generate_expression(ns, t.reset, expr_cache)[0] + ";\n")
+                _generate_node(r, ns, AssignType.NON_BLOCKING, 1, g[1], expr_cache=expr_cache)
+                r.append("end\n")
+    r.append("\n")
+    return "".join(r)
 
 # ------------------------------------------------------------------------------------------------ #
 #                                    SYNCHRONOUS LOGIC                                             #
 # ------------------------------------------------------------------------------------------------ #
 
-def _generate_synchronous_logic(f, ns):
-    r = ""
+def _generate_synchronous_logic(f, ns, expr_cache):
+    r = []
     for k, v in sorted(f.sync.items(), key=itemgetter(0)):
-        r += "always @(posedge " + ns.get_name(f.clock_domains[k].clk) + ") begin\n"
-        r += _generate_node(ns, AssignType.SIGNAL, 1, v)
-        r += "end\n\n"
-    return r
+        r.append("always @(posedge " + ns.get_name(f.clock_domains[k].clk) + ") begin\n")
+        _generate_node(r, ns, AssignType.SIGNAL, 1, v, expr_cache=expr_cache)
+        r.append("end\n\n")
+    return "".join(r)
 
 # ------------------------------------------------------------------------------------------------ #
 #                                      SPECIALS                                                    #
 # ------------------------------------------------------------------------------------------------ #
 
 def _generate_specials(name, overrides, specials, namespace, add_data_file, attr_translate):
-    r = ""
+    r = []
     for special in sorted(specials, key=lambda x: x.duid):
         if hasattr(special, "attr"):
-            r += _generate_attribute(special.attr, attr_translate)
+            r.append(_generate_attribute(special.attr, attr_translate))
         # Replace Migen Memory's emit_verilog with LiteX's implementation.
         if isinstance(special, Memory):
-            from litex.gen.fhdl.memory import _memory_generate_verilog
             pr = _memory_generate_verilog(name, special, namespace, add_data_file)
         # Replace Migen Instance's emit_verilog with LiteX's implementation.
         elif isinstance(special, Instance):
-            from litex.gen.fhdl.instance import _instance_generate_verilog
             pr = _instance_generate_verilog(special, namespace, add_data_file)
         else:
             pr = call_special_classmethod(overrides, special, "emit_verilog", namespace, add_data_file)
         if pr is None:
             raise NotImplementedError("Special " + str(special) + " failed to implement emit_verilog")
-        r += pr
-    return r
+        r.append(pr)
+    return "".join(r)
 
 # ------------------------------------------------------------------------------------------------ #
 #                                       LOWERER                                                    #
@@ -423,20 +435,24 @@ def _generate_specials(name, overrides, specials, namespace, add_data_file, attr
 def _lower_slice_cat(node, start, length):
     while isinstance(node, Cat):
         cat_start = 0
+        end       = start + length
         for e in node.l:
-            if cat_start <= start < cat_start + len(e) >= start + length:
+            cat_end = cat_start + len(e)
+            # Slice fully contained in this Cat element.
+            if cat_start <= start < cat_end and end <= cat_end:
                 start -= cat_start
                 node = e
                 break
-            cat_start += len(e)
+            cat_start = cat_end
         else:
             break
     return node, start
 
 def _lower_slice_replicate(node, start, length):
     while isinstance(node, Replicate):
-        if start//len(node.v) == (start + length - 1)//len(node.v):
-            start = start % len(node.v)
+        v_len = len(node.v)
+        if start//v_len == (start + length - 1)//v_len:
+            start = start % v_len
             node = node.v
         else:
             break
@@ -480,6 +496,10 @@ class DummyAttrTranslate(dict):
     def __getitem__(self, k):
         return (k, "true")
 
+    # dict.get does not go through __getitem__, override it too (used by _generate_attribute).
+    def get(self, k, default=None):
+        return (k, "true")
+
 def convert(f, ios=set(), name="top", platform=None,
     # Verilog parameters.
     special_overrides = dict(),
@@ -528,8 +548,9 @@ def convert(f, ios=set(), name="top", platform=None,
             s.platform = platform
     f, lowered_specials = lower_specials(special_overrides, f)
 
-    # Lower basics (for basics included in specials).
-    f = lower_basics(f)
+    # Lower basics (for basics included in lowered specials).
+    if lowered_specials:
+        f = lower_basics(f)
 
     # IOs collection (when not specified).
     if len(ios) == 0:
@@ -543,75 +564,95 @@ def convert(f, ios=set(), name="top", platform=None,
             if io_name:
                 io.name_override = io_name
 
+    # Signals/Targets/Wires collection.
+    sigs         = list_signals(f) | list_special_ios(f, ins=True, outs=True, inouts=True)
+    special_outs = list_special_ios(f, ins=False, outs=True,  inouts=True)
+    inouts       = list_special_ios(f, ins=False, outs=False, inouts=True)
+    targets      = list_targets(f) | special_outs
+    comb_groups  = group_by_targets(f.comb)
+    wires        = _list_comb_wires(comb_groups) | special_outs
+
     # Build Signal Namespace.
     # ----------------------
     ns = build_signal_namespace(
-        signals = (
-            list_signals(f) |
-            list_special_ios(f, ins=True, outs=True, inouts=True) |
-            ios
-        ),
+        signals           = sigs | ios,
         reserved_keywords = _ieee_1800_2017_verilog_reserved_keywords
     )
     ns.clock_domains = f.clock_domains
 
+    # Resolve Signal names once. get_name numbers colliding names in request order: request IOs
+    # first, then the other Signals, as the Module/Signals generators did, to keep names stable.
+    name_of = {}
+    for sig in ios:
+        name_of[sig] = ns.get_name(sig)
+    for sig in sigs - ios:
+        name_of[sig] = ns.get_name(sig)
+
+    # Expression cache (per conversion).
+    expr_cache = {}
+
     # Build Verilog.
     # --------------
-    verilog = ""
+    verilog = []
+
+    # Banner/Trailer infos (shared so both report the same date).
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # Banner.
-    verilog += _generate_banner(
+    verilog.append(_generate_banner(
         filename = name,
-        device   = getattr(platform, "device", "Unknown")
-    )
+        device   = getattr(platform, "device", "Unknown"),
+        revision = _cached_git_revision(),
+        date     = date
+    ))
 
     # Timescale.
-    verilog += _generate_timescale(
+    verilog.append(_generate_timescale(
         time_unit      = time_unit,
         time_precision = time_precision
-    )
+    ))
 
     # Module Definition.
-    verilog += _generate_separator("Module")
-    verilog += _generate_module(f, ios, name, ns, attr_translate)
+    verilog.append(_generate_separator("Module"))
+    verilog.append(_generate_module(ios, name, ns, name_of, targets, inouts, wires, attr_translate))
 
     # Module Hierarchy.
-    verilog += _generate_separator("Hierarchy")
-    verilog += _generate_hierarchy(top=LiteXContext.top)
+    verilog.append(_generate_separator("Hierarchy"))
+    verilog.append(_generate_hierarchy(top=LiteXContext.top))
 
     # Module Signals.
-    verilog += _generate_separator("Signals")
-    verilog += _generate_signals(f, ios, name, ns, attr_translate, regs_init)
+    verilog.append(_generate_separator("Signals"))
+    verilog.append(_generate_signals(sigs, ios, ns, name_of, expr_cache, wires, attr_translate, regs_init))
 
     # Combinatorial Logic.
-    verilog += _generate_separator("Combinatorial Logic")
+    verilog.append(_generate_separator("Combinatorial Logic"))
     if regular_comb:
-        verilog += _generate_combinatorial_logic_synth(f, ns)
+        verilog.append(_generate_combinatorial_logic_synth(comb_groups, ns, name_of, expr_cache))
     else:
-        verilog += _generate_combinatorial_logic_sim(f, ns)
+        verilog.append(_generate_combinatorial_logic_sim(f, ns, name_of, expr_cache))
 
     # Synchronous Logic.
-    verilog += _generate_separator("Synchronous Logic")
-    verilog += _generate_synchronous_logic(f, ns)
+    verilog.append(_generate_separator("Synchronous Logic"))
+    verilog.append(_generate_synchronous_logic(f, ns, expr_cache))
 
     # Specials
-    verilog += _generate_separator("Specialized Logic")
-    verilog += _generate_specials(
+    verilog.append(_generate_separator("Specialized Logic"))
+    verilog.append(_generate_specials(
         name           = name,
         overrides      = special_overrides,
         specials       = f.specials - lowered_specials,
         namespace      = ns,
         add_data_file  = r.add_data_file,
         attr_translate = attr_translate
-    )
+    ))
 
     # Module End.
-    verilog += "endmodule\n"
+    verilog.append("endmodule\n")
 
     # Trailer.
-    verilog += _generate_trailer()
+    verilog.append(_generate_trailer(date=date))
 
-    r.set_main_source(verilog)
+    r.set_main_source("".join(verilog))
     r.ns = ns
 
     return r
@@ -0,0 +1,36 @@
+#
+# This file is part of LiteX.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen.fhdl.verilog import convert
+
+class TestVerilog(unittest.TestCase):
+    def convert_test(self, signal):
+        class DUT(Module):
+            def __init__(self):
+                self.i = Signal()
+                self.o = Signal()
+                self.clock_domains.cd_sys = ClockDomain("sys")
+                self.sync += signal.eq(self.i)
+                self.comb += self.o.eq(signal)
+
+        dut = DUT()
+        ios = {dut.i, dut.o, dut.cd_sys.clk, dut.cd_sys.rst}
+        return convert(dut, ios=ios, name="dut").main_source
+
+    def test_default_attr_translate(self):
+        signal = Signal(attr={"keep"})
+        verilog = self.convert_test(signal)
+        self.assertIn("(* keep = \"true\" *)", verilog)
+
+    def test_reserved_keyword_renaming(self):
+        signal = Signal(name_override="repeat")
+        verilog = self.convert_test(signal)
+        self.assertIn("repeat_1", verilog)
+        self.assertNotIn(" repeat ", verilog)
+        self.assertNotIn(" repeat;", verilog)